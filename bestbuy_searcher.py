@@ -9,6 +9,7 @@ import re
 from urllib.parse import urljoin, quote_plus
 import json
 import os
+import time
 
 # Load environment variables from .env file if it exists
 try:
@@ -18,6 +19,26 @@ except ImportError:
     # dotenv not installed, continue without it
     pass
 
+MAX_RESULTS = 10  # Limit to first 10 results
+MAX_PRICE = 5995
+
+# Candidate keys for each product field in Oxylabs JSON content, in priority order
+OXYLABS_FIELD_KEYS = {
+    'name': ('title', 'name'),
+    'price': ('price', 'price_range'),
+    'image_url': ('image', 'image_url'),
+    'product_url': ('url', 'product_url'),
+}
+
+# Possible product container selectors in Best Buy HTML, in priority order
+HTML_CONTAINER_SELECTORS = (
+    ('div', {'class': 'shop-sku-list-item'}),
+    ('li', {'class': 'sku-item'}),
+    ('div', {'class': 'sku-item'}),
+    ('div', {'data-testid': 'product-card'}),
+    ('div', {'class': 'product-card'}),
+)
+
 class BestBuySearcher:
     def __init__(self, root):
         self.root = root
@@ -43,6 +64,7 @@ class BestBuySearcher:
         self.search_var = tk.StringVar()
         self.products = []
         self.current_images = []  # Keep references to prevent garbage collection
+        self.extract_metrics = {}  # Parse/extract timings per Oxylabs content shape
         
         self.setup_ui()
         
@@ -263,92 +285,7 @@ class BestBuySearcher:
                 print(">>>>> Response data keys:", list(data.keys()) if isinstance(data, dict) else 'Not a dict');
                 
                 # Extract products from the response
-                if 'results' in data and len(data['results']) > 0:
-                    result = data['results'][0]
-                    print(">>>>> Result keys:", list(result.keys()) if isinstance(result, dict) else 'Not a dict');
-                    
-                    # Check if content is a string (HTML) or dict (JSON)
-                    if 'content' in result:
-                        content = result['content']
-                        print(">>>>> Content type:", type(content));
-                        
-                        # print(">>>>> Content:", content);
-                        
-                        if isinstance(content, str):
-                            # Content is HTML string (fallback), parse it
-                            soup = BeautifulSoup(content, 'html.parser')
-                            
-                            # Try different possible product container selectors
-                            product_containers = (
-                                soup.find_all('div', class_='shop-sku-list-item') or
-                                soup.find_all('li', class_='sku-item') or
-                                soup.find_all('div', class_='sku-item') or
-                                soup.find_all('div', {'data-testid': 'product-card'}) or
-                                soup.find_all('div', class_='product-card')
-                            )
-                            
-                            print(f">>>>> Found {len(product_containers)} product containers in HTML (fallback)");
-                            
-                            for container in product_containers[:10]:  # Limit to first 10 results
-                                try:
-                                    product = self._extract_product_info(container, query)
-                                    if product and product['price'] < 5995:  # Double-check price filter
-                                        products.append(product)
-                                except Exception as e:
-                                    print(f">>>>> Error processing product: {e}");
-                                    continue
-                        elif isinstance(content, dict):
-                            # Content is JSON, let's explore its structure
-                            print(">>>>> Content keys:", list(content.keys()));
-                            print(">>>>> Content sample:", str(content)[:500] + "..." if len(str(content)) > 500 else str(content));
-                            
-                            # Try different possible structures
-                            if 'results' in content:
-                                raw_products = content['results']
-                                print(f">>>>> Found {len(raw_products)} raw products in JSON");
-                                
-                                for raw_product in raw_products[:10]:  # Limit to first 10 results
-                                    try:
-                                        product = self._process_oxylabs_product(raw_product, query)
-                                        if product and product['price'] < 5995:  # Double-check price filter
-                                            products.append(product)
-                                    except Exception as e:
-                                        print(f">>>>> Error processing product: {e}");
-                                        continue
-                            elif 'products' in content:
-                                raw_products = content['products']
-                                print(f">>>>> Found {len(raw_products)} products in JSON");
-                                
-                                for raw_product in raw_products[:10]:  # Limit to first 10 results
-                                    try:
-                                        product = self._process_oxylabs_product(raw_product, query)
-                                        if product and product['price'] < 5995:  # Double-check price filter
-                                            products.append(product)
-                                    except Exception as e:
-                                        print(f">>>>> Error processing product: {e}");
-                                        continue
-                            elif 'content' in content:
-                                # Nested content structure
-                                nested_content = content['content']
-                                print(">>>>> Found nested content, exploring...");
-                                if isinstance(nested_content, list):
-                                    for item in nested_content[:10]:
-                                        try:
-                                            product = self._process_oxylabs_product(item, query)
-                                            if product and product['price'] < 5995:
-                                                products.append(product)
-                                        except Exception as e:
-                                            print(f">>>>> Error processing nested product: {e}");
-                                            continue
-                            else:
-                                print(">>>>> Content is dict but no 'results', 'products', or 'content' found");
-                                print(">>>>> Available keys:", list(content.keys()));
-                        else:
-                            print(">>>>> Content is neither HTML string nor JSON with results");
-                    else:
-                        print(">>>>> No 'content' in result");
-                else:
-                    print(">>>>> No 'results' in data or empty results");
+                products = self._extract_products(data, query)
                 
                 # Save HTML content to file and open in Chrome for debugging
                 if 'results' in data and len(data['results']) > 0:
@@ -447,41 +384,135 @@ class BestBuySearcher:
         
         return None
         
+    def _detect_schema(self, data):
+        """Detect which Oxylabs content shape a response uses.
+        Returns (shape, payload) where payload is the HTML string or the list of raw products"""
+        if not ('results' in data and len(data['results']) > 0):
+            print(">>>>> No 'results' in data or empty results");
+            return None, None
+        
+        result = data['results'][0]
+        print(">>>>> Result keys:", list(result.keys()) if isinstance(result, dict) else 'Not a dict');
+        
+        if 'content' not in result:
+            print(">>>>> No 'content' in result");
+            return None, None
+        
+        content = result['content']
+        print(">>>>> Content type:", type(content));
+        
+        if isinstance(content, str):
+            return 'html', content
+        if isinstance(content, dict):
+            # Content is JSON, let's explore its structure
+            print(">>>>> Content keys:", list(content.keys()));
+            print(">>>>> Content sample:", str(content)[:500] + "..." if len(str(content)) > 500 else str(content));
+            for shape in ('results', 'products'):
+                if shape in content:
+                    return shape, content[shape]
+            if 'content' in content:
+                print(">>>>> Found nested content, exploring...");
+                if isinstance(content['content'], list):
+                    return 'nested', content['content']
+                return None, None
+            print(">>>>> Content is dict but no 'results', 'products', or 'content' found");
+            print(">>>>> Available keys:", list(content.keys()));
+            return None, None
+        
+        print(">>>>> Content is neither HTML string nor JSON with results");
+        return None, None
+        
+    def _extract_products(self, data, query):
+        """Extract products from any Oxylabs response shape with a single pipeline.
+        The schema is detected once per payload and the whole batch goes through the same extractor"""
+        shape, payload = self._detect_schema(data)
+        if shape is None:
+            return []
+        
+        start = time.perf_counter()
+        if shape == 'html':
+            # Content is HTML string (fallback), parse it
+            soup = BeautifulSoup(payload, 'html.parser')
+            items = self._find_product_containers(soup)
+        else:
+            items = payload if isinstance(payload, list) else []
+        parse_time = time.perf_counter() - start
+        
+        print(f">>>>> Found {len(items)} raw products ({shape})");
+        
+        products = []
+        start = time.perf_counter()
+        for item in items[:MAX_RESULTS]:
+            try:
+                if shape == 'html':
+                    product = self._extract_product_info(item, query)
+                else:
+                    product = self._process_oxylabs_product(item, query)
+                if product and product['price'] < MAX_PRICE:  # Double-check price filter
+                    products.append(product)
+            except Exception as e:
+                print(f">>>>> Error processing product: {e}");
+                continue
+        extract_time = time.perf_counter() - start
+        
+        self._record_extract_metrics(shape, parse_time, extract_time, len(products))
+        return products
+        
+    def _find_product_containers(self, soup):
+        """Find product containers in HTML using the first selector that matches"""
+        for name, attrs in HTML_CONTAINER_SELECTORS:
+            containers = soup.find_all(name, attrs)
+            if containers:
+                return containers
+        return []
+        
     def _process_oxylabs_product(self, raw_product, query):
         """Process product data from Oxylabs Real-Time API response"""
-        try:
-            # Extract product information from the structured response
-            name = raw_product.get('title', raw_product.get('name', '')).strip()
-            if not name:
-                name = f"{query} - Product"
-            
-            # Extract price - try different possible fields
-            price_text = raw_product.get('price', raw_product.get('price_range', '$0'))
-            price = self._extract_price(price_text)
-            
-            # Extract image URL
-            image_url = raw_product.get('image', raw_product.get('image_url', ''))
-            if image_url and not image_url.startswith('http'):
-                image_url = urljoin('https://www.bestbuy.com', image_url)
-            
-            # Extract product URL
-            product_url = raw_product.get('url', raw_product.get('product_url', ''))
-            if product_url and not product_url.startswith('http'):
-                product_url = urljoin('https://www.bestbuy.com', product_url)
-            
-            print(f">>>>> Processing product: {name[:50]}... | Price: {price_text} | Image: {image_url[:50] if image_url else 'None'}...");
-            
-            if name and price > 0:
-                return {
-                    'name': name,
-                    'price': price,
-                    'image_url': image_url,
-                    'product_url': product_url
-                }
-        except Exception as e:
-            print(f"Error processing Oxylabs product: {e}")
+        if not isinstance(raw_product, dict):
+            print(f">>>>> Skipping non-dict product: {type(raw_product).__name__}");
+            return None
+        
+        name = (self._get_product_field(raw_product, 'name') or '').strip()
+        if not name:
+            name = f"{query} - Product"
         
+        price_text = self._get_product_field(raw_product, 'price', '$0')
+        price = self._extract_price(price_text)
+        
+        image_url = self._get_product_field(raw_product, 'image_url') or ''
+        if image_url and not image_url.startswith('http'):
+            image_url = urljoin('https://www.bestbuy.com', image_url)
+        
+        product_url = self._get_product_field(raw_product, 'product_url') or ''
+        if product_url and not product_url.startswith('http'):
+            product_url = urljoin('https://www.bestbuy.com', product_url)
+        
+        print(f">>>>> Processing product: {name[:50]}... | Price: {price_text} | Image: {image_url[:50] if image_url else 'None'}...");
+        
+        if price > 0:
+            return {
+                'name': name,
+                'price': price,
+                'image_url': image_url,
+                'product_url': product_url
+            }
         return None
+        
+    def _get_product_field(self, raw_product, field, default=None):
+        """Read a field from the first candidate key present, in OXYLABS_FIELD_KEYS priority order"""
+        return next((raw_product[key] for key in OXYLABS_FIELD_KEYS[field] if key in raw_product), default)
+        
+    def _record_extract_metrics(self, shape, parse_time, extract_time, count):
+        """Accumulate parse/extract timings per content shape and report them"""
+        metrics = self.extract_metrics.setdefault(shape, {'payloads': 0, 'products': 0, 'parse': 0.0, 'extract': 0.0})
+        metrics['payloads'] += 1
+        metrics['products'] += count
+        metrics['parse'] += parse_time
+        metrics['extract'] += extract_time
+        print(f"⏱️  {shape}: parse {parse_time * 1000:.1f}ms, extract {extract_time * 1000:.1f}ms, "
+              f"{count} products (totals over {metrics['payloads']} payloads: "
+              f"parse {metrics['parse'] * 1000:.1f}ms, extract {metrics['extract'] * 1000:.1f}ms, "
+              f"{metrics['products']} products)")
             
     def _extract_price(self, price_text):
         """Extract numeric price from price text"""